@@ -11,11 +11,11 @@ from .limiter import limiter
 
 contact = Blueprint("contact", __name__)
 
+FORM_RATE_LIMITS = "20/day;10/hour;3/minute"
+
 
 @contact.route("/contact", methods=["GET", "POST"])
-@limiter.limit("20/day")
-@limiter.limit("10/hour")
-@limiter.limit("3/minute")
+@limiter.limit(FORM_RATE_LIMITS)
 def contact_route():
     if request.method == "POST":
         email = request.values.get("email")
@@ -75,9 +75,7 @@ def contact_route():
 
 
 @contact.route("/report", methods=["GET", "POST"])
-@limiter.limit("20/day")
-@limiter.limit("10/hour")
-@limiter.limit("3/minute")
+@limiter.limit(FORM_RATE_LIMITS)
 def report():
     if request.method == "POST":
         short_code = request.values.get("short_code")
@@ -1,9 +1,17 @@
 from flask import Blueprint, render_template, request
 from .limiter import limiter
-import os
+from pathlib import Path
 
 docs = Blueprint("docs", __name__)
 
+DOCS_DIR = Path("templates/docs")
+
+# Collect the available pages once at import instead of stat-ing on every request
+DOCS_PAGES = frozenset(
+    path.relative_to(DOCS_DIR).with_suffix("").as_posix()
+    for path in DOCS_DIR.rglob("*.html")
+)
+
 
 @docs.route("/docs")
 @docs.route("/docs/")
@@ -16,7 +24,7 @@ def serve_docs_index():
 @limiter.exempt
 def serve_docs(file_path):
     try:
-        if not os.path.exists(f"templates/docs/{file_path}.html"):
+        if file_path not in DOCS_PAGES:
             raise FileNotFoundError
         return render_template(f"docs/{file_path}.html", host_url=request.host_url)
     except Exception:
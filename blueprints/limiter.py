@@ -1,12 +1,16 @@
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from utils.mongo_utils import MONGO_URI, ip_bypasses
-from flask import request
+from utils.mongo_utils import MONGO_URI, get_ip_bypasses
+from flask import g, request
+import os
+
+# Rate limit counters live in MongoDB unless a dedicated store (e.g. redis://) is set
+RATELIMIT_STORAGE_URI = os.environ.get("RATELIMIT_STORAGE_URI") or MONGO_URI
 
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=["5 per minute", "500 per day", "50 per hour"],
-    storage_uri=MONGO_URI,
+    storage_uri=RATELIMIT_STORAGE_URI,
     strategy="fixed-window",
 )
 
@@ -16,7 +20,9 @@ def ip_whitelist():
     if request.method == "GET":
         return True
 
-    bypasses = ip_bypasses.find()
-    bypasses = [doc["_id"] for doc in bypasses]
+    # The filter runs once in before_request and again for each decorated
+    # limit, so remember the decision for the rest of the request
+    if "ip_whitelisted" not in g:
+        g.ip_whitelisted = request.remote_addr in get_ip_bypasses()
 
-    return request.remote_addr in bypasses
+    return g.ip_whitelisted
@@ -5,15 +5,13 @@ from utils.mongo_utils import (
     load_url,
     load_emoji_url,
 )
-from utils.url_utils import (
-    validate_emoji_alias,
-    convert_to_gmt,
-)
+from utils.url_utils import validate_emoji_alias
 from utils.analytics_utils import (
     calculate_click_averages,
     add_missing_dates,
     top_four,
     convert_country_data,
+    get_expiry_status,
 )
 from utils.export_utils import (
     export_to_csv,
@@ -24,7 +22,6 @@ from utils.export_utils import (
 from utils.pipeline_utils import get_stats_pipeline
 from .limiter import limiter
 
-from datetime import datetime, timezone
 from urllib.parse import unquote
 import json
 
@@ -148,17 +145,7 @@ def analytics(short_code):
                         400,
                     )
 
-    if url_data["max-clicks"] is not None:
-        url_data["expired"] = url_data["total-clicks"] >= int(url_data["max-clicks"])
-    else:
-        url_data["expired"] = None
-
-    if url_data["expiration-time"] is not None:
-        expiration_time = convert_to_gmt(url_data["expiration-time"])
-        if not expiration_time:
-            print("Expiration time is not timezone aware")
-        elif expiration_time <= datetime.now(timezone.utc):
-            url_data["expired"] = True
+    url_data["expired"] = get_expiry_status(url_data)
 
     url_data["short_code"] = short_code
 
@@ -204,15 +191,15 @@ def analytics(short_code):
         )
 
 
+EXPORT_FORMATS = frozenset(("csv", "json", "xlsx", "xml"))
+
+
 @stats.route("/export/<short_code>/<format>", methods=["GET", "POST"])
 @limiter.exempt
 def export(short_code, format):
     format = format.lower()
-    password = request.values.get("password")
-    short_code = unquote(short_code)
-    pipeline = get_stats_pipeline(short_code)
 
-    if format not in ["csv", "json", "xlsx", "xml"]:
+    if format not in EXPORT_FORMATS:
         if request.method == "GET":
             return (
                 render_template(
@@ -233,6 +220,10 @@ def export(short_code, format):
                 400,
             )
 
+    password = request.values.get("password")
+    short_code = unquote(short_code)
+    pipeline = get_stats_pipeline(short_code)
+
     if validate_emoji_alias(short_code):
         url_data = aggregate_emoji_url(pipeline)
     else:
@@ -277,17 +268,7 @@ def export(short_code, format):
 
     url_data["short_code"] = short_code
 
-    if url_data["max-clicks"] is not None:
-        url_data["expired"] = url_data["total-clicks"] >= int(url_data["max-clicks"])
-    else:
-        url_data["expired"] = None
-
-    if url_data["expiration-time"] is not None:
-        expiration_time = convert_to_gmt(url_data["expiration-time"])
-        if not expiration_time:
-            print("Expiration time is not timezone aware")
-        elif expiration_time <= datetime.now(timezone.utc):
-            url_data["expired"] = True
+    url_data["expired"] = get_expiry_status(url_data)
 
     (
         url_data["average_daily_clicks"],
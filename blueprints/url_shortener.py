@@ -9,7 +9,8 @@ from flask import (
     make_response,
 )
 from utils.url_utils import (
-    BOT_USER_AGENTS,
+    BOT_USER_AGENT_PATTERNS,
+    BOT_USER_AGENTS_RE,
     get_country,
     get_client_ip,
     validate_password,
@@ -33,11 +34,12 @@ from utils.mongo_utils import (
     validate_blocked_url,
     urls_collection,
 )
-from utils.general import is_positive_integer, humanize_number
+from utils.general import is_positive_integer, is_truthy, humanize_number
 from .limiter import limiter
 from .cache import cache
 
-from user_agents import parse
+import user_agents
+import functools
 import json
 from datetime import datetime, timezone
 from urllib.parse import unquote
@@ -50,6 +52,13 @@ url_shortener = Blueprint("url_shortener", __name__)
 crawler_detect = CrawlerDetect()
 tld_no_cache_extract = tldextract.TLDExtract(cache_dir=None)
 
+# The same handful of User-Agent strings account for most redirects, and
+# parsing one runs the whole ua-parser regex list
+parse = functools.lru_cache(maxsize=1024)(user_agents.parse)
+
+# Characters that cannot appear in MongoDB field names
+MONGO_KEY_UNSAFE_RE = re.compile(r"[.$\x00-\x1F\x7F-\x9F]")
+
 
 @url_shortener.route("/", methods=["GET"])
 @limiter.exempt
@@ -70,10 +79,11 @@ def shorten_url():
     max_clicks = request.values.get("max-clicks")
     alias = request.values.get("alias")
     expiration_time = request.values.get("expiration-time")
-    block_bots = request.values.get("block-bots")
+    block_bots = is_truthy(request.values.get("block-bots"))
+    wants_json = request.headers.get("Accept") == "application/json"
 
     if not url:
-        if request.headers.get("Accept") == "application/json":
+        if wants_json:
             return jsonify({"UrlError": "URL is required"}), 400
         else:
             return (
@@ -99,7 +109,7 @@ def shorten_url():
         return jsonify({"BlockedUrlError": "Blocked URL ⛔"}), 403
 
     if alias and not validate_alias(alias):
-        if request.headers.get("Accept") == "application/json":
+        if wants_json:
             return jsonify({"AliasError": "Invalid Alias", "alias": f"{alias}"}), 400
         else:
             return (
@@ -116,7 +126,7 @@ def shorten_url():
         short_code = alias[:11]
 
     if alias and check_if_slug_exists(alias[:11]):
-        if request.headers.get("Accept") == "application/json":
+        if wants_json:
             return (
                 jsonify({"AliasError": "Alias already exists", "alias": f"{alias}"}),
                 400,
@@ -134,11 +144,8 @@ def shorten_url():
     elif alias:
         short_code = alias[:11]
     else:
-        while True:
-            short_code = generate_short_code()
-
-            if not check_if_slug_exists(short_code):
-                break
+        # Generated when inserting, see below
+        short_code = None
 
     if password:
         if not validate_password(password):
@@ -168,7 +175,7 @@ def shorten_url():
                 400,
             )
         else:
-            max_clicks = str(abs(int(str(max_clicks))))
+            max_clicks = str(int(max_clicks))
         data["max-clicks"] = max_clicks
 
     # custom expiration time is currently really buggy and not ready for production
@@ -189,32 +196,35 @@ def shorten_url():
     if block_bots:
         data["block-bots"] = True
 
-    data["creation-date"] = datetime.now().strftime("%Y-%m-%d")
-    data["creation-time"] = datetime.now().strftime("%H:%M:%S")
+    now = datetime.now()
+    data["creation-date"] = now.strftime("%Y-%m-%d")
+    data["creation-time"] = now.strftime("%H:%M:%S")
 
     data["creation-ip-address"] = get_client_ip()
 
-    insert_url(short_code, data)
-
-    response = jsonify({"short_url": f"{request.host_url}{short_code}"})
-
-    if request.headers.get("Accept") == "application/json":
-        return response
+    if short_code:
+        insert_url(short_code, data)
     else:
-        serialized_list = request.cookies.get("shortURL")
-        my_list = json.loads(serialized_list) if serialized_list else []
-        my_list.insert(0, short_code)
-        if len(my_list) > 3:
-            del my_list[-1]
-        serialized_list = json.dumps(my_list)
-        resp = make_response(
-            redirect(url_for("url_shortener.result", short_code=short_code))
-        )
-        resp.set_cookie("shortURL", serialized_list)
+        # _id is unique, so a colliding generated code just fails the insert
+        short_code = generate_short_code()
+        while not insert_url(short_code, data):
+            short_code = generate_short_code()
 
-        return resp
+    if wants_json:
+        return jsonify({"short_url": f"{request.host_url}{short_code}"})
+
+    serialized_list = request.cookies.get("shortURL")
+    my_list = json.loads(serialized_list) if serialized_list else []
+    my_list.insert(0, short_code)
+    if len(my_list) > 3:
+        del my_list[-1]
+    serialized_list = json.dumps(my_list)
+    resp = make_response(
+        redirect(url_for("url_shortener.result", short_code=short_code))
+    )
+    resp.set_cookie("shortURL", serialized_list)
 
-    return response
+    return resp
 
 
 @url_shortener.route("/emoji", methods=["GET", "POST"])
@@ -224,7 +234,7 @@ def emoji():
     password = request.values.get("password")
     max_clicks = request.values.get("max-clicks")
     expiration_time = request.values.get("expiration-time")
-    block_bots = request.values.get("block-bots")
+    block_bots = is_truthy(request.values.get("block-bots"))
 
     if not url:
         return jsonify({"UrlError": "URL is required"}), 400
@@ -237,11 +247,8 @@ def emoji():
         if check_if_emoji_alias_exists(emojies):
             return jsonify({"EmojiError": "Emoji already exists"}), 400
     else:
-        while True:
-            emojies = generate_emoji_alias()
-
-            if not check_if_emoji_alias_exists(emojies):
-                break
+        # Generated when inserting, see below
+        emojies = None
 
     if url and not validate_url(url):
         return (
@@ -277,7 +284,7 @@ def emoji():
                 400,
             )
         else:
-            max_clicks = str(abs(int(str(max_clicks))))
+            max_clicks = str(int(max_clicks))
         data["max-clicks"] = max_clicks
 
     # custom expiration time is currently really buggy and not ready for production
@@ -298,17 +305,22 @@ def emoji():
     if block_bots:
         data["block-bots"] = True
 
-    data["creation-date"] = datetime.now().strftime("%Y-%m-%d")
-    data["creation-time"] = datetime.now().strftime("%H:%M:%S")
+    now = datetime.now()
+    data["creation-date"] = now.strftime("%Y-%m-%d")
+    data["creation-time"] = now.strftime("%H:%M:%S")
 
     data["creation-ip-address"] = get_client_ip()
 
-    insert_emoji_url(emojies, data)
-
-    response = jsonify({"short_url": f"{request.host_url}{emojies}"})
+    if emojies:
+        insert_emoji_url(emojies, data)
+    else:
+        # _id is unique, so a colliding generated alias just fails the insert
+        emojies = generate_emoji_alias()
+        while not insert_emoji_url(emojies, data):
+            emojies = generate_emoji_alias()
 
     if request.headers.get("Accept") == "application/json":
-        return response
+        return jsonify({"short_url": f"{request.host_url}{emojies}"})
 
     return redirect(url_for("url_shortener.result", short_code=emojies))
 
@@ -316,11 +328,14 @@ def emoji():
 @url_shortener.route("/result/<short_code>", methods=["GET"])
 @limiter.exempt
 def result(short_code):
+    # Only the existence of the short code matters here, not its analytics
+    projection = {"_id": 1}
+
     short_code = unquote(short_code)
     if validate_emoji_alias(short_code):
-        url_data = load_emoji_url(short_code)
+        url_data = load_emoji_url(short_code, projection)
     else:
-        url_data = load_url(short_code)
+        url_data = load_url(short_code, projection)
 
     if url_data:
         short_code = url_data["_id"]
@@ -365,6 +380,7 @@ def redirect_url(short_code):
 
     # Measure redirection time
     start_time = time.perf_counter()
+    now = datetime.now(timezone.utc)
 
     if validate_emoji_alias(short_code):
         is_emoji = True
@@ -385,8 +401,9 @@ def redirect_url(short_code):
 
     url = url_data["url"]
 
-    if "max-clicks" in url_data:
-        if int(url_data["total-clicks"]) >= int(url_data["max-clicks"]):
+    max_clicks = url_data.get("max-clicks")
+    if max_clicks is not None:
+        if int(url_data["total-clicks"]) >= int(max_clicks):
             return (
                 render_template(
                     "error.html",
@@ -399,11 +416,11 @@ def redirect_url(short_code):
 
     # custom expiration time is currently really buggy and not ready for production
 
-    if "expiration-time" in url_data:
-        expiration_time = convert_to_gmt(url_data["expiration-time"])
-        if not expiration_time:
-            print("Expiration time is not timezone aware")
-        elif expiration_time <= datetime.now(timezone.utc):
+    expiration_time = url_data.get("expiration-time")
+    if expiration_time is not None:
+        # A timezone-naive expiration time cannot be compared, so it never expires
+        expiration_time = convert_to_gmt(expiration_time)
+        if expiration_time and expiration_time <= now:
             return (
                 render_template(
                     "error.html",
@@ -414,9 +431,10 @@ def redirect_url(short_code):
                 400,
             )
 
-    if "password" in url_data:
+    stored_password = url_data.get("password")
+    if stored_password is not None:
         password = request.values.get("password")
-        if password != url_data["password"]:
+        if password != stored_password:
             return (
                 render_template(
                     "password.html", short_code=short_code, host_url=request.host_url
@@ -453,7 +471,7 @@ def redirect_url(short_code):
             if referrer_raw.suffix
             else referrer_raw.domain
         )
-        sanitized_referrer = re.sub(r"[.$\x00-\x1F\x7F-\x9F]", "_", referrer)
+        sanitized_referrer = MONGO_KEY_UNSAFE_RE.sub("_", referrer)
 
         updates["$inc"][f"referrer.{sanitized_referrer}.counts"] = 1
         updates["$addToSet"][f"referrer.{sanitized_referrer}.ips"] = user_ip
@@ -467,8 +485,10 @@ def redirect_url(short_code):
     updates["$inc"][f"os_name.{os_name}.counts"] = 1
     updates["$addToSet"][f"os_name.{os_name}.ips"] = user_ip
 
-    for bot in BOT_USER_AGENTS:
-        bot_re = re.compile(bot, re.IGNORECASE)
+    bot_patterns = (
+        BOT_USER_AGENT_PATTERNS if BOT_USER_AGENTS_RE.search(user_agent) else ()
+    )
+    for bot, bot_re in bot_patterns:
         if bot_re.search(user_agent):
             if url_data.get("block-bots", False):
                 return (
@@ -481,7 +501,7 @@ def redirect_url(short_code):
                     ),
                     403,
                 )
-            sanitized_bot = re.sub(r"[.$\x00-\x1F\x7F-\x9F]", "_", bot)
+            sanitized_bot = MONGO_KEY_UNSAFE_RE.sub("_", bot)
             updates["$inc"][f"bots.{sanitized_bot}"] = 1
             break
     else:
@@ -500,7 +520,7 @@ def redirect_url(short_code):
             updates["$inc"][f"bots.{crawler_detect.getMatches()}"] = 1
 
     # increment the counter for the short code
-    today = str(datetime.now()).split()[0]
+    today = now.astimezone().date().isoformat()
     updates["$inc"][f"counter.{today}"] = 1
 
     if is_unique_click:
@@ -510,9 +530,7 @@ def redirect_url(short_code):
 
     updates["$inc"]["total-clicks"] = 1
 
-    updates["$set"]["last-click"] = str(
-        datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-    )
+    updates["$set"]["last-click"] = now.strftime("%Y-%m-%d %H:%M:%S")
     updates["$set"]["last-click-browser"] = browser
     updates["$set"]["last-click-os"] = os_name
     updates["$set"]["last-click-country"] = country
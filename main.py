@@ -20,6 +20,8 @@ from blueprints.cache import cache
 from utils.mongo_utils import client
 
 app = Flask(__name__)
+# Analytics payloads are large and their date series are already ordered
+app.json.sort_keys = False
 CORS(app)
 limiter.init_app(app)
 cache.init_app(app)
@@ -1,6 +1,16 @@
+import pytest
+
 from utils.mongo_utils import validate_blocked_url
 
 
+@pytest.fixture(autouse=True)
+def reset_blocked_url_cache(mocker):
+    # Each test mocks its own blocklist, so start from an expired cache
+    mocker.patch.dict(
+        "utils.mongo_utils.blocked_url_patterns", {"patterns": [], "expires_at": 0.0}
+    )
+
+
 def test_url_not_blocked(mocker):
     # Mock the database call to return an empty list
     mocker.patch("utils.mongo_utils.blocked_urls_collection.find", return_value=[])
@@ -47,3 +57,14 @@ def test_url_with_regex_pattern(mocker):
     assert not validate_blocked_url(
         "https://www.example.com"
     )  # URL matches regex pattern
+
+
+def test_blocked_urls_are_cached(mocker):
+    # Mock the database call and check it is only queried once within the TTL
+    mock_find = mocker.patch(
+        "utils.mongo_utils.blocked_urls_collection.find",
+        return_value=[{"_id": "example.com"}],
+    )
+    assert not validate_blocked_url("https://www.example.com")
+    assert validate_blocked_url("https://www.spoo.me")
+    mock_find.assert_called_once()
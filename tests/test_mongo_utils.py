@@ -0,0 +1,24 @@
+from utils.mongo_utils import insert_emoji_url, insert_url
+
+
+def test_insert_url(mocker, mock_db):
+    mocker.patch("utils.mongo_utils.urls_collection", mock_db.urls)
+
+    assert insert_url("abc123", {"url": "http://example.com"})
+    assert mock_db.urls.find_one({"_id": "abc123"})["url"] == "http://example.com"
+
+
+def test_insert_url_short_code_taken(mocker, mock_db):
+    mocker.patch("utils.mongo_utils.urls_collection", mock_db.urls)
+    mock_db.urls.insert_one({"_id": "abc123", "url": "http://example.com"})
+
+    assert not insert_url("abc123", {"url": "http://example.org"})
+    assert mock_db.urls.find_one({"_id": "abc123"})["url"] == "http://example.com"
+
+
+def test_insert_emoji_url_alias_taken(mocker, mock_db):
+    mocker.patch("utils.mongo_utils.emoji_urls_collection", mock_db.emojis)
+    mock_db.emojis.insert_one({"_id": "😀😀😀", "url": "http://example.com"})
+
+    assert not insert_emoji_url("😀😀😀", {"url": "http://example.org"})
+    assert insert_emoji_url("😀😀😁", {"url": "http://example.org"})
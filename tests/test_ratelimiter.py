@@ -3,6 +3,7 @@ from flask import Flask
 from blueprints.url_shortener import url_shortener
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from blueprints.limiter import ip_whitelist
 
 
 @pytest.fixture
@@ -26,7 +27,6 @@ def client():
 
 
 def test_rate_limiter(client, mocker):
-    mocker.patch("blueprints.url_shortener.check_if_slug_exists", return_value=False)
     mocker.patch(
         "blueprints.url_shortener.generate_short_code", return_value="shortcode"
     )
@@ -47,5 +47,45 @@ def test_rate_limiter(client, mocker):
     assert b"Too Many Requests" in response.data
 
 
+def test_ip_whitelist_queries_once_per_request(mocker):
+    mock_bypasses = mocker.patch(
+        "blueprints.limiter.get_ip_bypasses", return_value=frozenset({"127.0.0.1"})
+    )
+    app = Flask(__name__)
+
+    with app.test_request_context(
+        "/", method="POST", environ_base={"REMOTE_ADDR": "127.0.0.1"}
+    ):
+        assert ip_whitelist() is True
+        assert ip_whitelist() is True
+        mock_bypasses.assert_called_once()
+
+    with app.test_request_context(
+        "/", method="POST", environ_base={"REMOTE_ADDR": "127.0.0.1"}
+    ):
+        assert ip_whitelist() is True
+
+    assert mock_bypasses.call_count == 2
+
+
+def test_ip_whitelist_reuses_bypasses_across_requests(mocker):
+    mocker.patch.dict(
+        "utils.mongo_utils.ip_bypass_addresses",
+        {"addresses": frozenset(), "expires_at": 0.0},
+    )
+    mock_find = mocker.patch(
+        "utils.mongo_utils.ip_bypasses.find", return_value=[{"_id": "127.0.0.1"}]
+    )
+    app = Flask(__name__)
+
+    for remote_addr, expected in (("127.0.0.1", True), ("10.0.0.1", False)):
+        with app.test_request_context(
+            "/", method="POST", environ_base={"REMOTE_ADDR": remote_addr}
+        ):
+            assert ip_whitelist() is expected
+
+    mock_find.assert_called_once()
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -112,7 +112,6 @@ def test_shorten_url_invalid_expiration_time(client):
 
 
 def test_shorten_url_success(client, mocker):
-    mocker.patch("blueprints.url_shortener.check_if_slug_exists", return_value=False)
     mocker.patch("blueprints.url_shortener.generate_short_code", return_value="abc123")
     mocker.patch("blueprints.url_shortener.insert_url")
     mocker.patch("blueprints.url_shortener.get_client_ip", return_value="127.0.0.1")
@@ -122,8 +121,24 @@ def test_shorten_url_success(client, mocker):
     assert response.headers["Location"].endswith("/result/abc123")
 
 
+def test_shorten_url_retries_taken_short_code(client, mocker):
+    mocker.patch("blueprints.url_shortener.validate_blocked_url", return_value=True)
+    mocker.patch(
+        "blueprints.url_shortener.generate_short_code",
+        side_effect=["taken1", "abc123"],
+    )
+    mock_insert = mocker.patch(
+        "blueprints.url_shortener.insert_url", side_effect=[False, True]
+    )
+    mocker.patch("blueprints.url_shortener.get_client_ip", return_value="127.0.0.1")
+
+    response = client.post("/", data={"url": "http://example.com"})
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/result/abc123")
+    assert mock_insert.call_count == 2
+
+
 def test_shorten_url_success_max_clicks(client, mocker):
-    mocker.patch("blueprints.url_shortener.check_if_slug_exists", return_value=False)
     mocker.patch("blueprints.url_shortener.generate_short_code", return_value="abc123")
     mocker.patch("blueprints.url_shortener.insert_url")
     mocker.patch("blueprints.url_shortener.get_client_ip", return_value="127.0.0.1")
@@ -134,7 +149,6 @@ def test_shorten_url_success_max_clicks(client, mocker):
 
 
 def test_shorten_url_success_password(client, mocker):
-    mocker.patch("blueprints.url_shortener.check_if_slug_exists", return_value=False)
     mocker.patch("blueprints.url_shortener.generate_short_code", return_value="abc123")
     mocker.patch("blueprints.url_shortener.insert_url")
     mocker.patch("blueprints.url_shortener.get_client_ip", return_value="127.0.0.1")
@@ -147,7 +161,6 @@ def test_shorten_url_success_password(client, mocker):
 
 
 def test_shorten_url_ratelimiting(client, mocker):
-    mocker.patch("blueprints.url_shortener.check_if_slug_exists", return_value=False)
     mocker.patch("blueprints.url_shortener.generate_short_code", return_value="abc123")
     mocker.patch("blueprints.url_shortener.insert_url")
     mocker.patch("blueprints.url_shortener.get_client_ip", return_value="127.0.0.1")
@@ -155,7 +168,6 @@ def test_shorten_url_ratelimiting(client, mocker):
 
 @pytest.mark.skip(reason="Feature not implemented yet")
 def test_shorten_url_success_expiration_time(client, mocker):
-    mocker.patch("blueprints.url_shortener.check_if_slug_exists", return_value=False)
     mocker.patch("blueprints.url_shortener.generate_short_code", return_value="abc123")
     mocker.patch("blueprints.url_shortener.insert_url")
     mocker.patch("blueprints.url_shortener.get_client_ip", return_value="127.0.0.1")
@@ -244,6 +256,22 @@ def test_emoji_success(client, mocker):
     )  # %F0%9F%98%80 is the url encoded version of 😀
 
 
+def test_emoji_retries_taken_alias(client, mocker):
+    mocker.patch("blueprints.url_shortener.validate_blocked_url", return_value=True)
+    mocker.patch(
+        "blueprints.url_shortener.generate_emoji_alias", side_effect=["😁", "😀"]
+    )
+    mock_insert = mocker.patch(
+        "blueprints.url_shortener.insert_emoji_url", side_effect=[False, True]
+    )
+    mocker.patch("blueprints.url_shortener.get_client_ip", return_value="127.0.0.1")
+
+    response = client.post("/emoji", data={"url": "http://example.com"})
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/result/%F0%9F%98%80")
+    assert mock_insert.call_count == 2
+
+
 def test_result_valid_short_code(client, mocker):
     mocker.patch("blueprints.url_shortener.validate_emoji_alias", return_value=False)
     mocker.patch("blueprints.url_shortener.load_url", return_value={"_id": "abc123"})
@@ -5,17 +5,20 @@ from utils.url_utils import (
     validate_alias,
     generate_short_code,
     validate_emoji_alias,
+    convert_to_gmt,
+    validate_expiration_time,
 )
-from utils.general import humanize_number, is_positive_integer
+from utils.general import humanize_number, is_positive_integer, is_truthy
 from utils.analytics_utils import (
     convert_country_name,
     add_missing_dates,
     top_four,
     calculate_click_averages,
+    get_expiry_status,
 )
 from flask import Flask
 import string
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from urllib.parse import unquote
 
 app = Flask(__name__)
@@ -142,6 +145,19 @@ def test_is_positive_integer_with_none():
     assert not is_positive_integer(None)
 
 
+# Test truthy values
+
+
+@pytest.mark.parametrize("value", ["true", "True", "1", "yes", "on", "t", "Y"])
+def test_is_truthy_with_truthy_values(value):
+    assert is_truthy(value)
+
+
+@pytest.mark.parametrize("value", [None, "", "false", "False", "0", "no", "off"])
+def test_is_truthy_with_falsy_values(value):
+    assert not is_truthy(value)
+
+
 # Test convert country name
 
 
@@ -504,3 +520,77 @@ def test_validate_emoji_alias_empty_string():
 
 def test_validate_emoji_alias_url_encoded():
     assert validate_emoji_alias(unquote("%F0%9F%98%8A"))  # URL encoded 😊
+
+
+def test_validate_emoji_alias_ascii_short_code():
+    assert not validate_emoji_alias("abc123")
+
+
+def test_validate_emoji_alias_percent_encoded_emoji():
+    assert validate_emoji_alias("%F0%9F%98%8A")
+
+
+# Test convert to gmt
+
+
+def test_convert_to_gmt_timezone_aware():
+    assert convert_to_gmt("2024-01-01T05:30:00+05:30") == datetime(
+        2024, 1, 1, tzinfo=timezone.utc
+    )
+
+
+def test_convert_to_gmt_timezone_naive():
+    assert convert_to_gmt("2024-01-01T00:00:00") is None
+
+
+def test_convert_to_gmt_caches_parsed_value():
+    convert_to_gmt.cache_clear()
+    convert_to_gmt("2024-06-01T12:00:00+00:00")
+    convert_to_gmt("2024-06-01T12:00:00+00:00")
+    assert convert_to_gmt.cache_info().hits == 1
+
+
+# Test validate expiration time
+
+
+def test_validate_expiration_time_future():
+    expiration_time = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+    assert validate_expiration_time(expiration_time)
+
+
+def test_validate_expiration_time_too_soon():
+    expiration_time = (datetime.now(timezone.utc) + timedelta(minutes=1)).isoformat()
+    assert not validate_expiration_time(expiration_time)
+
+
+def test_validate_expiration_time_timezone_naive():
+    expiration_time = (datetime.now() + timedelta(hours=1)).isoformat()
+    assert not validate_expiration_time(expiration_time)
+
+
+def test_validate_expiration_time_invalid_format():
+    assert not validate_expiration_time("tomorrow")
+
+
+# Test expiry status
+
+
+def test_get_expiry_status_no_limits():
+    data = {"max-clicks": None, "expiration-time": None, "total-clicks": 10}
+    assert get_expiry_status(data) is None
+
+
+def test_get_expiry_status_max_clicks():
+    data = {"max-clicks": "10", "expiration-time": None, "total-clicks": 10}
+    assert get_expiry_status(data) is True
+    data["total-clicks"] = 9
+    assert get_expiry_status(data) is False
+
+
+def test_get_expiry_status_expiration_time_passed():
+    data = {
+        "max-clicks": "10",
+        "expiration-time": "2000-01-01T00:00:00+00:00",
+        "total-clicks": 0,
+    }
+    assert get_expiry_status(data) is True
@@ -1,6 +1,7 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import functools
 import pycountry
+from utils.url_utils import convert_to_gmt
 
 
 def convert_country_data(data):
@@ -22,29 +23,19 @@ def convert_country_name(country_name: str) -> str:
 def add_missing_dates(key, url_data):
     counter = url_data[key]
 
-    # Get the current date
-
     # Get the first and last click dates
-    first_click_date = url_data["creation-date"]  # next(iter(counter.keys()))
-    last_click_date = datetime.now().strftime("%Y-%m-%d")
-
-    # Convert the click dates to datetime objects
-    first_date = datetime.strptime(first_click_date, "%Y-%m-%d")
-    last_date = datetime.strptime(last_click_date, "%Y-%m-%d")
+    first_date = datetime.strptime(url_data["creation-date"], "%Y-%m-%d").date()
+    last_date = datetime.now().date()
 
-    # Generate a list of dates between the first and last click dates
-    date_range = [
-        first_date + timedelta(days=x) for x in range((last_date - first_date).days + 1)
-    ]
-    all_dates = [date.strftime("%Y-%m-%d") for date in date_range]
-
-    # Add missing dates with a counter value of 0
-    for date in all_dates:
-        if date not in counter:
-            counter[date] = 0
+    # Add missing dates with a counter value of 0, walking the range once
+    one_day = timedelta(days=1)
+    current = first_date
+    while current <= last_date:
+        counter.setdefault(current.isoformat(), 0)
+        current += one_day
 
     # Sort the counter dictionary by dates
-    sorted_counter = {date: counter[date] for date in sorted(counter.keys())}
+    sorted_counter = {day: counter[day] for day in sorted(counter.keys())}
 
     # Update the url_data with the modified counter
     url_data[key] = sorted_counter
@@ -84,3 +75,17 @@ def calculate_click_averages(data):
     avg_monthly_clicks = round(total_clicks / 30, 2)  # Assuming 30 days in a month
 
     return avg_daily_clicks, avg_weekly_clicks, avg_monthly_clicks
+
+
+def get_expiry_status(data):
+    if data["max-clicks"] is not None:
+        expired = data["total-clicks"] >= int(data["max-clicks"])
+    else:
+        expired = None
+
+    if data["expiration-time"] is not None:
+        expiration_time = convert_to_gmt(data["expiration-time"])
+        if expiration_time and expiration_time <= datetime.now(timezone.utc):
+            expired = True
+
+    return expired
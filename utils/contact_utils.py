@@ -9,11 +9,14 @@ CONTACT_WEBHOOK = os.environ["CONTACT_WEBHOOK"]
 URL_REPORT_WEBHOOK = os.environ["URL_REPORT_WEBHOOK"]
 hcaptcha_secret = os.environ.get("HCAPTCHA_SECRET")
 
+# Reuse connections to hCaptcha and the webhooks instead of a new TLS handshake per post
+http_session = requests.Session()
+
 
 def verify_hcaptcha(token):
     hcaptcha_verify_url = "https://hcaptcha.com/siteverify"
 
-    response = requests.post(
+    response = http_session.post(
         hcaptcha_verify_url,
         data={
             "response": token,
@@ -49,7 +52,7 @@ def send_report(webhook_uri, short_code, reason, ip_address, host_uri):
         ]
     }
 
-    requests.post(webhook_uri, json=data)
+    http_session.post(webhook_uri, json=data)
 
 
 def send_contact_message(webhook_uri, email, message):
@@ -71,4 +74,4 @@ def send_contact_message(webhook_uri, email, message):
         ]
     }
 
-    requests.post(webhook_uri, json=data)
+    http_session.post(webhook_uri, json=data)
@@ -1,5 +1,6 @@
 import io
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment
 import csv
 import zipfile
@@ -10,14 +11,16 @@ from flask import send_file
 
 def export_to_excel(data):
     output = io.BytesIO()
-    wb = Workbook()
+    # Write-only mode streams rows to the file instead of building a cell tree
+    wb = Workbook(write_only=True)
 
     # Bold font style
     bold_font = Font(bold=True)
+    right_alignment = Alignment(horizontal="right")
+    center_alignment = Alignment(horizontal="center")
 
     # General Info Sheet
-    ws_general_info = wb.active
-    ws_general_info.title = "General_Info"
+    ws_general_info = wb.create_sheet("General_Info")
     general_info = [
         ["TOTAL CLICKS", data["total-clicks"]],
         ["TOTAL UNIQUE CLICKS", data["total_unique_clicks"]],
@@ -39,35 +42,36 @@ def export_to_excel(data):
         ["LAST CLICK OS", data["last-click-os"]],
         ["LAST CLICK COUNTRY", data["last-click-country"]],
     ]
-    for row in general_info:
-        ws_general_info.append(row)
-
-    # Apply bold font style to the first column (headers)
-    for cell in ws_general_info["A"]:
-        cell.font = bold_font
 
     # Set column widths
     ws_general_info.column_dimensions["A"].width = 25
     ws_general_info.column_dimensions["B"].width = 20
 
-    # Align the second column to the right
-    for cell in ws_general_info["B"]:
-        cell.alignment = Alignment(horizontal="right")
+    # Bold the first column (headers) and align the second column to the right
+    for key, value in general_info:
+        key_cell = WriteOnlyCell(ws_general_info, value=key)
+        key_cell.font = bold_font
+        value_cell = WriteOnlyCell(ws_general_info, value=value)
+        value_cell.alignment = right_alignment
+        ws_general_info.append([key_cell, value_cell])
 
     # Helper function to add data to sheets
     def add_sheet(wb, title, data, columns):
         ws = wb.create_sheet(title)
-        ws.append(columns)
 
         ws.column_dimensions["A"].width = 20
 
-        for key, value in data.items():
-            ws.append([key, value])
-
         # Apply bold font style to the first row (headers) and center align them
-        for cell in ws[1]:
+        header = []
+        for column in columns:
+            cell = WriteOnlyCell(ws, value=column)
             cell.font = bold_font
-            cell.alignment = Alignment(horizontal="center")
+            cell.alignment = center_alignment
+            header.append(cell)
+        ws.append(header)
+
+        for row in data.items():
+            ws.append(row)
 
     # Adding other sheets
     add_sheet(wb, "Browser", data["browser"], ["Browser", "Count"])
@@ -103,14 +107,16 @@ def export_to_csv(data):
             with io.TextIOWrapper(file, encoding="utf-8", newline="") as text_file:
                 writer = csv.writer(text_file)
                 writer.writerow([key_field, value_field])
-                for key, value in dictionary.items():
-                    if isinstance(value, dict):
-                        # Handle nested dictionaries
-                        value = value.get("counts", 0)
-                    writer.writerow([key, value])
-
-    # Create a zip file in memory
-    with zipfile.ZipFile(output, mode="w", compression=zipfile.ZIP_DEFLATED) as zipf:
+                # Handle nested dictionaries and hand all rows to the writer at once
+                writer.writerows(
+                    (key, value.get("counts", 0) if isinstance(value, dict) else value)
+                    for key, value in dictionary.items()
+                )
+
+    # Create a zip file in memory, favouring deflate speed over ratio
+    with zipfile.ZipFile(
+        output, mode="w", compression=zipfile.ZIP_DEFLATED, compresslevel=1
+    ) as zipf:
         # Write general info CSV
         general_info = {
             "TOTAL CLICKS": data.get("total-clicks", "N/A"),
@@ -138,8 +144,7 @@ def export_to_csv(data):
         with zipf.open("general_info.csv", "w") as file:
             with io.TextIOWrapper(file, encoding="utf-8", newline="") as text_file:
                 writer = csv.writer(text_file)
-                for key, value in general_info.items():
-                    writer.writerow([key, value])
+                writer.writerows(general_info.items())
 
         # Write other CSV files dynamically
         fields = {
@@ -176,12 +181,8 @@ def export_to_csv(data):
 
 
 def export_to_json(data):
-    output = io.StringIO()
-
-    json.dump(data, output, indent=4)
-    output.seek(0)
-
-    output_bytes = io.BytesIO(output.getvalue().encode())
+    # Serialize in one call and wrap the encoded bytes directly
+    output_bytes = io.BytesIO(json.dumps(data, indent=4).encode())
 
     return send_file(
         output_bytes,
@@ -4,16 +4,18 @@ import random
 
 def is_positive_integer(value):
     try:
-        int(value)
-        if int(value) < 0:
-            return False
-        return True
-    except ValueError:
-        return False
-    except TypeError:
+        return int(value) >= 0
+    except (ValueError, TypeError):
         return False
 
 
+TRUTHY_VALUES = frozenset(("1", "true", "yes", "on", "t", "y"))
+
+
+def is_truthy(value):
+    return value is not None and value.lower() in TRUTHY_VALUES
+
+
 def generate_passkey():
     letters = string.ascii_lowercase + string.ascii_uppercase + string.digits
     return "".join(random.choice(letters) for i in range(22))
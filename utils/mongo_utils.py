@@ -1,7 +1,9 @@
 from pymongo import MongoClient
+from pymongo.errors import DuplicateKeyError
 from dotenv import load_dotenv
 import os
 import re
+import time
 
 load_dotenv(override=True)
 
@@ -41,10 +43,14 @@ def aggregate_url(pipeline):
 
 
 def insert_url(id, url_data):
+    # Returns False only when the short code is already taken
     try:
         urls_collection.insert_one({"_id": id, **url_data})
+    except DuplicateKeyError:
+        return False
     except Exception:
         pass
+    return True
 
 
 def update_url(id, updates):
@@ -81,10 +87,14 @@ def aggregate_emoji_url(pipeline):
 
 
 def insert_emoji_url(alias, emoji_data):
+    # Returns False only when the emoji alias is already taken
     try:
         emoji_urls_collection.insert_one({"_id": alias, **emoji_data})
+    except DuplicateKeyError:
+        return False
     except Exception:
         pass
+    return True
 
 
 def update_emoji_url(alias, updates):
@@ -95,19 +105,47 @@ def update_emoji_url(alias, updates):
 
 
 def check_if_emoji_alias_exists(emoji_alias):
+    projection = {"_id": 1}
     try:
-        emoji_data = emoji_urls_collection.find_one({"_id": emoji_alias})
+        emoji_data = emoji_urls_collection.find_one({"_id": emoji_alias}, projection)
     except Exception:
         emoji_data = None
     return emoji_data is not None
 
 
-def validate_blocked_url(url):
-    blocked_urls = blocked_urls_collection.find()
-    blocked_urls = [doc["_id"] for doc in blocked_urls]
+# The blocklist rarely changes, so keep compiled patterns around for a while
+BLOCKED_URLS_CACHE_TTL = 60  # seconds
+blocked_url_patterns = {"patterns": [], "expires_at": 0.0}
+
+
+def get_blocked_url_patterns():
+    now = time.monotonic()
+    if now >= blocked_url_patterns["expires_at"]:
+        blocked_urls = blocked_urls_collection.find()
+        blocked_url_patterns["patterns"] = [
+            re.compile(doc["_id"]) for doc in blocked_urls
+        ]
+        blocked_url_patterns["expires_at"] = now + BLOCKED_URLS_CACHE_TTL
+    return blocked_url_patterns["patterns"]
 
-    for blocked_url in blocked_urls:
-        if re.search(blocked_url, url):
+
+# Bypassed IPs are checked on every POST by the rate limiter
+IP_BYPASSES_CACHE_TTL = 60  # seconds
+ip_bypass_addresses = {"addresses": frozenset(), "expires_at": 0.0}
+
+
+def get_ip_bypasses():
+    now = time.monotonic()
+    if now >= ip_bypass_addresses["expires_at"]:
+        bypasses = ip_bypasses.find({}, {"_id": 1})
+        ip_bypass_addresses["addresses"] = frozenset(doc["_id"] for doc in bypasses)
+        ip_bypass_addresses["expires_at"] = now + IP_BYPASSES_CACHE_TTL
+    return ip_bypass_addresses["addresses"]
+
+
+def validate_blocked_url(url):
+    for blocked_url in get_blocked_url_patterns():
+        if blocked_url.search(url):
             return False
 
     return True
@@ -14,51 +14,58 @@ def _create_field_transform(field_name):
                 "$map": {
                     "input": {"$objectToArray": f"${field_name}"},
                     "as": "item",
-                    "in": {
-                        "k": "$$item.k",
-                        "v": {"$size": {"$setUnion": ["$$item.v.ips"]}},
-                    },
+                    # ips is maintained with $addToSet, so it holds no duplicates
+                    "in": {"k": "$$item.k", "v": {"$size": "$$item.v.ips"}},
                 }
             }
         },
     }
 
 
-def get_stats_pipeline(short_code):
-    fields = ["browser", "os_name", "country", "referrer"]
-    add_fields = {}
-    for field in fields:
-        add_fields |= _create_field_transform(field)
+# Everything after the $match stage is the same for every short code
+STATS_FIELDS = ("browser", "os_name", "country", "referrer")
+
+STATS_PROJECT_STAGE = {
+    "$project": {
+        "url": 1,
+        "browser": {"$ifNull": ["$browser", {}]},
+        "os_name": {"$ifNull": ["$os_name", {}]},
+        "country": {"$ifNull": ["$country", {}]},
+        "referrer": {"$ifNull": ["$referrer", {}]},
+        "total_unique_clicks": {"$size": "$ips"},
+        "total-clicks": {"$ifNull": ["$total-clicks", 0]},
+        "max-clicks": {"$ifNull": ["$max-clicks", None]},
+        "expiration-time": {"$ifNull": ["$expiration-time", None]},
+        "password": {"$ifNull": ["$password", None]},
+        "short_code": {"$ifNull": ["$short_code", None]},
+        "last-click-browser": {"$ifNull": ["$last-click-browser", None]},
+        "last-click-os": {"$ifNull": ["$last-click-os", None]},
+        "last-click-country": {"$ifNull": ["$last-click-country", None]},
+        "block-bots": {"$ifNull": ["$block-bots", False]},
+        "bots": {"$ifNull": ["$bots", {}]},
+        "counter": {"$ifNull": ["$counter", {}]},
+        "unique_counter": {"$ifNull": ["$unique_counter", {}]},
+        "average_redirection_time": {"$ifNull": ["$average_redirection_time", 0]},
+        "creation-date": {"$ifNull": ["$creation-date", None]},
+        "creation-time": {"$ifNull": ["$creation-time", None]},
+        "last-click": {"$ifNull": ["$last-click", None]},
+    }
+}
+
+STATS_ADD_FIELDS_STAGE = {
+    "$addFields": {
+        key: value
+        for field in STATS_FIELDS
+        for key, value in _create_field_transform(field).items()
+    }
+}
 
+
+# The shared stages are reused by every stats/export request, so callers must
+# treat the returned pipeline as read-only
+def get_stats_pipeline(short_code):
     return [
         {"$match": {"_id": short_code}},
-        {
-            "$project": {
-                "url": 1,
-                "browser": {"$ifNull": ["$browser", {}]},
-                "os_name": {"$ifNull": ["$os_name", {}]},
-                "country": {"$ifNull": ["$country", {}]},
-                "referrer": {"$ifNull": ["$referrer", {}]},
-                "total_unique_clicks": {"$size": "$ips"},
-                "total-clicks": {"$ifNull": ["$total-clicks", 0]},
-                "max-clicks": {"$ifNull": ["$max-clicks", None]},
-                "expiration-time": {"$ifNull": ["$expiration-time", None]},
-                "password": {"$ifNull": ["$password", None]},
-                "short_code": {"$ifNull": ["$short_code", None]},
-                "last-click-browser": {"$ifNull": ["$last-click-browser", None]},
-                "last-click-os": {"$ifNull": ["$last-click-os", None]},
-                "last-click-country": {"$ifNull": ["$last-click-country", None]},
-                "block-bots": {"$ifNull": ["$block-bots", False]},
-                "bots": {"$ifNull": ["$bots", {}]},
-                "counter": {"$ifNull": ["$counter", {}]},
-                "unique_counter": {"$ifNull": ["$unique_counter", {}]},
-                "average_redirection_time": {
-                    "$ifNull": ["$average_redirection_time", 0]
-                },
-                "creation-date": {"$ifNull": ["$creation-date", None]},
-                "creation-time": {"$ifNull": ["$creation-time", None]},
-                "last-click": {"$ifNull": ["$last-click", None]},
-            }
-        },
-        {"$addFields": add_fields},
+        STATS_PROJECT_STAGE,
+        STATS_ADD_FIELDS_STAGE,
     ]
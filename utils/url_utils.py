@@ -1,5 +1,6 @@
 import re
 import string
+import functools
 import random
 from datetime import datetime, timedelta, timezone
 from emojies import EMOJIES
@@ -16,17 +17,26 @@ with open("bot_user_agents.txt", "r") as file:
         i.strip() for i in BOT_USER_AGENTS.split("\n") if i.strip() != ""
     ]
 
+BOT_USER_AGENT_PATTERNS = [
+    (bot, re.compile(bot, re.IGNORECASE)) for bot in BOT_USER_AGENTS
+]
+# All bot patterns in one alternation, so regular browsers are ruled out in one scan
+BOT_USER_AGENTS_RE = re.compile(
+    "|".join(f"(?:{bot})" for bot in BOT_USER_AGENTS), re.IGNORECASE
+)
+
+
+# Opened once per process; the reader is thread-safe and memory-maps the database
+geoip_reader = geoip2.database.Reader("misc/GeoLite2-Country.mmdb")
+
 
 def get_country(ip_address):
-    reader = geoip2.database.Reader("misc/GeoLite2-Country.mmdb")
     try:
-        response = reader.country(ip_address)
+        response = geoip_reader.country(ip_address)
         country = response.country.name
         return country
     except geoip2.errors.AddressNotFoundError:
         return "Unknown"
-    finally:
-        reader.close()
 
 
 def get_client_ip():
@@ -40,21 +50,27 @@ def get_client_ip():
         return request.environ.get("REMOTE_ADDR", "")
 
 
+PASSWORD_LETTER_RE = re.compile(r"[a-zA-Z]")
+PASSWORD_DIGIT_RE = re.compile(r"\d")
+PASSWORD_SPECIAL_RE = re.compile(r"[@.]")
+PASSWORD_CONSECUTIVE_SPECIAL_RE = re.compile(r"[@.]{2}")
+
+
 def validate_password(password):
     # Check if the password is at least 8 characters long
     if len(password) < 8:
         return False
 
     # Check if the password contains a letter, a number, and the allowed special characters
-    if not re.search(r"[a-zA-Z]", password):
+    if not PASSWORD_LETTER_RE.search(password):
         return False
-    if not re.search(r"\d", password):
+    if not PASSWORD_DIGIT_RE.search(password):
         return False
-    if not re.search(r"[@.]", password):
+    if not PASSWORD_SPECIAL_RE.search(password):
         return False
 
     # Check if there are consecutive special characters
-    if re.search(r"[@.]{2}", password):
+    if PASSWORD_CONSECUTIVE_SPECIAL_RE.search(password):
         return False
 
     return True
@@ -70,33 +86,16 @@ def validate_url(url):
 # custom expiration time is currently really buggy and not ready for production
 def validate_expiration_time(expiration_time):
     try:
-        expiration_time = datetime.fromisoformat(expiration_time)
-        # Check if it's timezone aware
-        if expiration_time.tzinfo is None:
-            print("timezone not aware")
-            return False
-        else:
-            print("timezone aware")
-            print("Expiration Time in GMT: ", expiration_time.astimezone(timezone.utc))
-            print(expiration_time.tzinfo)
-            # Convert to GMT if it's timezone aware
-            expiration_time = expiration_time.astimezone(timezone.utc)
-        if expiration_time < datetime.now(timezone.utc) + timedelta(minutes=3):
-            print(expiration_time, datetime.now(timezone.utc) + timedelta(minutes=3))
-            print("EXPIRATION TIME IN GMT: ", expiration_time)
-            print("CURRENT TIME IN GMT: ", datetime.now(timezone.utc))
-            print(
-                "CURRENT TIME IN GMT + 5: ",
-                datetime.now(timezone.utc) + timedelta(minutes=4.5),
-            )
-            print("less than 5 minutes")
-            return False
-        return True
-    except Exception as e:
-        print(e)
+        expiration_time = convert_to_gmt(expiration_time)
+    except Exception:
         return False
+    # Must be timezone aware and at least a few minutes in the future
+    if expiration_time is None:
+        return False
+    return expiration_time >= datetime.now(timezone.utc) + timedelta(minutes=3)
 
 
+@functools.lru_cache(maxsize=256)
 def convert_to_gmt(expiration_time):
     expiration_time = datetime.fromisoformat(expiration_time)
     # Check if it's timezone aware
@@ -108,22 +107,29 @@ def convert_to_gmt(expiration_time):
     return expiration_time
 
 
+SHORT_CODE_CHARACTERS = string.ascii_lowercase + string.ascii_uppercase + string.digits
+
+
 def generate_short_code():
-    letters = string.ascii_lowercase + string.ascii_uppercase + string.digits
-    return "".join(random.choice(letters) for i in range(6))
+    return "".join(random.choices(SHORT_CODE_CHARACTERS, k=6))
+
+
+ALIAS_RE = re.compile(r"^[a-zA-Z0-9_-]*$")
 
 
 def validate_alias(string):
-    pattern = r"^[a-zA-Z0-9_-]*$"
-    return bool(re.search(pattern, string))
+    return bool(ALIAS_RE.search(string))
 
 
 def generate_emoji_alias():
-    return "".join(random.choice(EMOJIES) for _ in range(3))
+    return "".join(random.choices(EMOJIES, k=3))
 
 
 def validate_emoji_alias(alias):
     alias = unquote(alias)
+    # Regular short codes are plain ASCII and can never be emojis
+    if alias.isascii():
+        return not alias
     emoji_list = emoji.emoji_list(alias)
     extracted_emojis = "".join([data["emoji"] for data in emoji_list])
     if len(extracted_emojis) != len(alias) or len(emoji_list) > 15: